@@ -1,7 +1,13 @@
 configs_dataframe = {
     "encoding" : "UTF-8",
     "delimiter": ",",
-    "engine": "pyarrow"
+    "engine": "pyarrow",
+    # Apenas as colunas usadas no estudo são lidas; o parser do pyarrow descarta as demais já na leitura
+    "usecols": [
+        "id", "data_inversa", "dia_semana", "horario", "br", "km", "municipio", "tipo_acidente", "fase_dia",
+        "sentido_via", "condicao_metereologica", "tipo_pista", "tracado_via", "uso_solo", "mortos",
+        "feridos_leves", "feridos_graves", "ilesos", "veiculos", "latitude", "longitude"
+    ]
 }
 
 caminho_datasets = "data"
\ No newline at end of file
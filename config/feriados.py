@@ -1,13 +1,14 @@
 # config/feriados.py
-from datetime import date
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-from pandas.tseries.offsets import Day
 from dateutil.easter import easter
 
-# Dicionário que armazenará feriados calculados para cada ano
-FERIADOS_POR_ANO: dict[int, list[pd.Timestamp]] = {}
 
-def gerar_feriados(ano: int) -> list[pd.Timestamp]:
+# O cache substitui o antigo dicionário FERIADOS_POR_ANO: cada ano é calculado uma única vez.
+# Como o DatetimeIndex é imutável, é seguro devolver a mesma instância a todos os chamadores.
+@lru_cache(maxsize=None)
+def gerar_feriados(ano: int) -> pd.DatetimeIndex:
     """
     Gera a lista de feriados nacionais brasileiros para um determinado ano.
 
@@ -26,33 +27,76 @@ def gerar_feriados(ano: int) -> list[pd.Timestamp]:
     - Proclamação da República (15 de Novembro)
     - Natal (25 de Dezembro)
 
+    As datas são montadas num único array datetime64[D] (os feriados móveis saem da Páscoa por soma de inteiros)
+    e convertidas uma única vez para DatetimeIndex (resolução ns, a mesma do pd.to_datetime).
+
     Parâmetros:
         ano (int): Ano para o qual os feriados serão calculados.
 
     Retorna:
-        list[pd.Timestamp]: Lista de feriados no formato Timestamp para o ano especificado.
+        pd.DatetimeIndex: Feriados do ano especificado.
+    """
+    pascoa = np.datetime64(easter(ano), 'D')
+
+    datas = np.array([
+        np.datetime64(f"{ano:04d}-01-01"),
+        pascoa - 48,
+        pascoa - 47,
+        pascoa - 2,
+        np.datetime64(f"{ano:04d}-04-21"),
+        np.datetime64(f"{ano:04d}-05-01"),
+        pascoa + 60,
+        np.datetime64(f"{ano:04d}-09-07"),
+        np.datetime64(f"{ano:04d}-10-12"),
+        np.datetime64(f"{ano:04d}-11-02"),
+        np.datetime64(f"{ano:04d}-11-15"),
+        np.datetime64(f"{ano:04d}-12-25"),
+        np.datetime64(f"{ano:04d}-04-23"),
+    ], dtype='datetime64[D]')
+
+    return pd.DatetimeIndex(datas.astype('datetime64[ns]'))
+
+
+def obter_feriados_ano(ano: int) -> pd.DatetimeIndex:
+    return gerar_feriados(ano)
+
+
+def obter_feriados_intervalo(ano_inicio: int, ano_fim: int) -> pd.DatetimeIndex:
+    """
+    Retorna, num único índice ordenado, os feriados de todos os anos do intervalo (inclusivo).
+
+    Parâmetros:
+        ano_inicio (int): Primeiro ano do intervalo.
+        ano_fim (int): Último ano do intervalo.
+
+    Retorna:
+        pd.DatetimeIndex: Feriados de ano_inicio até ano_fim, em ordem cronológica.
+    """
+    datas = np.concatenate([gerar_feriados(ano).to_numpy() for ano in range(ano_inicio, ano_fim + 1)])
+    return pd.DatetimeIndex(datas).sort_values()
+
+
+@lru_cache(maxsize=32)
+def _feriados_i8(ano_inicio: int, ano_fim: int) -> np.ndarray:
+    # Feriados do intervalo como inteiros (ns desde a época), para comparação direta via np.isin
+    return obter_feriados_intervalo(ano_inicio, ano_fim).asi8
+
+
+def em_feriado(datas) -> np.ndarray:
+    """
+    Verifica, de forma vetorizada, quais datas caem em feriado.
+
+    Parâmetros:
+        datas: Sequência de datas (DatetimeIndex, Series datetime64 ou qualquer coisa aceita pelo pd.DatetimeIndex).
+            O horário é desconsiderado e datas nulas (NaT) nunca são feriado.
+
+    Retorna:
+        np.ndarray: Array booleano, True onde a data correspondente é feriado.
     """
-    pascoa = pd.Timestamp(easter(ano))
-
-    return [
-        pd.Timestamp(date(ano, 1, 1)),
-        pascoa - Day(48),
-        pascoa - Day(47),
-        pascoa - Day(2),
-        pd.Timestamp(date(ano, 4, 21)),
-        pd.Timestamp(date(ano, 5, 1)),
-        pascoa + Day(60),
-        pd.Timestamp(date(ano, 9, 7)),
-        pd.Timestamp(date(ano, 10, 12)),
-        pd.Timestamp(date(ano, 11, 2)),
-        pd.Timestamp(date(ano, 11, 15)),
-        pd.Timestamp(date(ano, 12, 25)),
-        pd.Timestamp(date(ano, 4, 23)),
-    ]
-
-
-def obter_feriados_ano(ano: int) -> list[pd.Timestamp]:
-    """Retorna a lista de feriados para o ano, usando cache para não recalcular."""
-    if ano not in FERIADOS_POR_ANO:
-        FERIADOS_POR_ANO[ano] = gerar_feriados(ano)
-    return FERIADOS_POR_ANO[ano]
+    datas = pd.DatetimeIndex(datas).as_unit('ns').normalize()
+    validas = datas.notna()
+    if not validas.any():
+        return np.zeros(len(datas), dtype=bool)
+
+    anos = datas[validas].year
+    return np.isin(datas.asi8, _feriados_i8(int(anos.min()), int(anos.max())))
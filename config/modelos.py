@@ -5,6 +5,7 @@ from sklearn.neighbors import KNeighborsClassifier
 from sklearn.svm import SVC
 from sklearn.neural_network import MLPClassifier
 from sklearn.linear_model import LogisticRegression
+from typing import NamedTuple
 
 """
 Lista de modelos que serão testados, com:
@@ -12,56 +13,66 @@ Lista de modelos que serão testados, com:
 - classe do modelo,
 - método de tuning ('optuna' ou 'skopt'),
 - parâmetros fixos adicionais (precisei fazer isso para o probability=True do SVC, não consegui pensar em outra forma).
+  Também é onde fica o n_jobs=-1 dos modelos que paralelizam internamente (árvores do RF, consultas do kNN).
 """
 
+
+class EspecificacaoModelo(NamedTuple):
+    nome: str
+    classe: type
+    metodo: str
+    search_space: str
+    parametros_fixos: dict
+
+
 modelos = [
-    {
-        "nome": "logistic_regression",
-        "classe": LogisticRegression,
-        "metodo": "skopt",
-        "search_space": "search_spaces_skopt",
-        "parametros_fixos": {}
-    },
-    {
-        "nome": "decision_tree",
-        "classe": DecisionTreeClassifier,
-        "metodo": "optuna",
-        "search_space": "search_spaces_optuna",
-        "parametros_fixos": {}
-    },
-    {
-        "nome": "random_forest",
-        "classe": RandomForestClassifier,
-        "metodo": "optuna",
-        "search_space": "search_spaces_optuna",
-        "parametros_fixos": {}
-    },
-    {
-        "nome": "naive_bayes",
-        "classe": GaussianNB,
-        "metodo": "optuna",
-        "search_space": "search_spaces_optuna",
-        "parametros_fixos": {}
-    },
-    {
-        "nome": "knn",
-        "classe": KNeighborsClassifier,
-        "metodo": "optuna",
-        "search_space": "search_spaces_optuna",
-        "parametros_fixos": {}
-    },
-    {
-        "nome": "svc",
-        "classe": SVC,
-        "metodo": "optuna",
-        "search_space": "search_spaces_optuna",
-        "parametros_fixos": {"probability": True}
-    },
-    {
-        "nome": "mlp",
-        "classe": MLPClassifier,
-        "metodo": "optuna",
-        "search_space": "search_spaces_optuna",
-        "parametros_fixos": {}
-    }
+    EspecificacaoModelo(
+        nome="logistic_regression",
+        classe=LogisticRegression,
+        metodo="skopt",
+        search_space="search_spaces_skopt",
+        parametros_fixos={}
+    ),
+    EspecificacaoModelo(
+        nome="decision_tree",
+        classe=DecisionTreeClassifier,
+        metodo="optuna",
+        search_space="search_spaces_optuna",
+        parametros_fixos={}
+    ),
+    EspecificacaoModelo(
+        nome="random_forest",
+        classe=RandomForestClassifier,
+        metodo="optuna",
+        search_space="search_spaces_optuna",
+        parametros_fixos={"n_jobs": -1, "random_state": 42}
+    ),
+    EspecificacaoModelo(
+        nome="naive_bayes",
+        classe=GaussianNB,
+        metodo="optuna",
+        search_space="search_spaces_optuna",
+        parametros_fixos={}
+    ),
+    EspecificacaoModelo(
+        nome="knn",
+        classe=KNeighborsClassifier,
+        metodo="optuna",
+        search_space="search_spaces_optuna",
+        parametros_fixos={"n_jobs": -1}
+    ),
+    EspecificacaoModelo(
+        nome="svc",
+        classe=SVC,
+        metodo="optuna",
+        search_space="search_spaces_optuna",
+        parametros_fixos={"probability": True, "cache_size": 512, "shrinking": True}
+    ),
+    EspecificacaoModelo(
+        nome="mlp",
+        classe=MLPClassifier,
+        metodo="optuna",
+        search_space="search_spaces_optuna",
+        parametros_fixos={}
+    )
 ]
\ No newline at end of file
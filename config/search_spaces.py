@@ -3,63 +3,86 @@ from skopt.space import Real, Integer, Categorical
 """
 Dicionários com espaços de busca de algoritmo para serem usados pelos seus respectivos tunadores de hiperparametros
 search_spaces_skopt = Regressão logística
-search_spaces_optuna = Todo o restante
+search_spaces_optuna = Todo o restante (cada modelo tem uma função "sugerir_<modelo>(tentativa)" no estilo define-by-run do optuna)
 
 (ainda não encontrei uma forma de utilizar o optuna ou o skopt para todos, mas não acredito ser problema - a busca bayesiana funciona do mesmo jeito
 nas duas bibliotecas)
 """
 
-search_spaces_optuna = {
-    "decision_tree": {
-        "criterion": lambda trial: trial.suggest_categorical("criterion", ["gini", "entropy", "log_loss"]),
-        "max_depth": lambda trial: trial.suggest_int("max_depth", 1, 100),
-        "min_samples_split": lambda trial: trial.suggest_int("min_samples_split", 2, 50),
-        "min_samples_leaf": lambda trial: trial.suggest_int("min_samples_leaf", 1, 50),
-        "max_features": lambda trial: trial.suggest_categorical("max_features", [None, "sqrt", "log2", 0.5]),
-        "ccp_alpha": lambda trial: trial.suggest_float("ccp_alpha", 1e-6, 0.1)
-    },
+def sugerir_decision_tree(tentativa) -> dict:
+    return {
+        "criterion": tentativa.suggest_categorical("criterion", ["gini", "entropy", "log_loss"]),
+        "max_depth": tentativa.suggest_int("max_depth", 1, 100),
+        "min_samples_split": tentativa.suggest_int("min_samples_split", 2, 50),
+        "min_samples_leaf": tentativa.suggest_int("min_samples_leaf", 1, 50),
+        "max_features": tentativa.suggest_categorical("max_features", [None, "sqrt", "log2", 0.5]),
+        "ccp_alpha": tentativa.suggest_float("ccp_alpha", 1e-6, 0.1)
+    }
 
-    "random_forest": {
-        "n_estimators": lambda trial: trial.suggest_int("n_estimators", 1, 200),
-        "criterion": lambda trial: trial.suggest_categorical("criterion", ["gini", "entropy", "log_loss"]),
-        "max_depth": lambda trial: trial.suggest_int("max_depth", 1, 100),
-        "min_samples_split": lambda trial: trial.suggest_int("min_samples_split", 2, 50),
-        "min_samples_leaf": lambda trial: trial.suggest_int("min_samples_leaf", 1, 50),
-        "max_features": lambda trial: trial.suggest_categorical("max_features", [None, "sqrt", "log2", 0.5]),
-        "bootstrap": lambda trial: trial.suggest_categorical("bootstrap", [True, False]),
-        "ccp_alpha": lambda trial: trial.suggest_float("ccp_alpha", 1e-6, 0.1)
-    },
 
-    "naive_bayes": {
-        "var_smoothing": lambda trial: trial.suggest_float("var_smoothing", 1e-10, 1e-2, log=True)
-    },
+def sugerir_random_forest(tentativa) -> dict:
+    return {
+        "n_estimators": tentativa.suggest_int("n_estimators", 10, 200),
+        "criterion": tentativa.suggest_categorical("criterion", ["gini", "entropy", "log_loss"]),
+        "max_depth": tentativa.suggest_int("max_depth", 1, 100),
+        "min_samples_split": tentativa.suggest_int("min_samples_split", 2, 50),
+        "min_samples_leaf": tentativa.suggest_int("min_samples_leaf", 1, 50),
+        "max_features": tentativa.suggest_categorical("max_features", [None, "sqrt", "log2", 0.5]),
+        "bootstrap": tentativa.suggest_categorical("bootstrap", [True, False]),
+        "ccp_alpha": tentativa.suggest_float("ccp_alpha", 1e-6, 0.1)
+    }
 
-    "knn": {
-        "n_neighbors": lambda trial: trial.suggest_int("n_neighbors", 1, 50),
-        "weights": lambda trial: trial.suggest_categorical("weights", ["uniform", "distance"]),
-        "metric": lambda trial: trial.suggest_categorical("metric", ["euclidean", "manhattan", "minkowski"]),
-        "algorithm": lambda trial: trial.suggest_categorical("algorithm", ["auto", "ball_tree", "kd_tree", "brute"]),
-        "leaf_size": lambda trial: trial.suggest_int("leaf_size", 20, 100),
-        "p": lambda trial: trial.suggest_categorical("p", [1, 2])
-    },
 
-    "svc": {
-        "C": lambda trial: trial.suggest_float("C", 1e-6, 1e6, log=True),
-        "kernel": lambda trial: trial.suggest_categorical("kernel", ["linear", "rbf", "poly"]),
-        "tol": lambda trial: trial.suggest_float("tol", 1e-6, 1e-2, log=True),
-        "max_iter": lambda trial: trial.suggest_int("max_iter", 50, 2000)
-    },
+def sugerir_naive_bayes(tentativa) -> dict:
+    return {
+        "var_smoothing": tentativa.suggest_float("var_smoothing", 1e-10, 1e-2, log=True)
+    }
+
 
-    "mlp": {
-        "hidden_layer_sizes": lambda trial: trial.suggest_categorical("hidden_layer_sizes", [(50,), (100,), (50, 50), (100, 100), (50, 100), (100, 50)]),
-        "activation": lambda trial: trial.suggest_categorical("activation", ["relu", "tanh", "logistic"]),
-        "solver": lambda trial: trial.suggest_categorical("solver", ["adam", "sgd"]),
-        "alpha": lambda trial: trial.suggest_float("alpha", 1e-5, 1e-1, log=True),
-        "learning_rate": lambda trial: trial.suggest_categorical("learning_rate", ["constant", "invscaling", "adaptive"]),
-        "learning_rate_init": lambda trial: trial.suggest_float("learning_rate_init", 1e-4, 1e-1, log=True),
-        "max_iter": lambda trial: trial.suggest_int("max_iter", 50, 10000),
-        "tol": lambda trial: trial.suggest_float("tol", 1e-4, 1e-2, log=True)
+def sugerir_knn(tentativa) -> dict:
+    # "minkowski" com p=1/p=2 é o mesmo que "manhattan"/"euclidean", então o p e a minkowski saem do espaço.
+    # O "brute" também sai: em dados de baixa dimensão como estes, kd_tree/ball_tree (ou o "auto") são mais rápidos.
+    # As métricas ficam como nomes (str) de propósito: o sklearn as resolve para implementações compiladas, enquanto
+    # uma métrica passada como função (mesmo compilada com numba) é chamada a cada par de pontos pelo Python.
+    return {
+        "n_neighbors": tentativa.suggest_int("n_neighbors", 1, 50),
+        "weights": tentativa.suggest_categorical("weights", ["uniform", "distance"]),
+        "metric": tentativa.suggest_categorical("metric", ["euclidean", "manhattan"]),
+        "algorithm": tentativa.suggest_categorical("algorithm", ["auto", "kd_tree", "ball_tree"]),
+        "leaf_size": tentativa.suggest_int("leaf_size", 20, 100)
     }
+
+
+def sugerir_svc(tentativa) -> dict:
+    return {
+        "C": tentativa.suggest_float("C", 1e-6, 1e6, log=True),
+        "kernel": tentativa.suggest_categorical("kernel", ["linear", "rbf"]),
+        "tol": tentativa.suggest_float("tol", 1e-6, 1e-2, log=True),
+        "max_iter": tentativa.suggest_int("max_iter", 50, 2000, log=True)
+    }
+
+
+def sugerir_mlp(tentativa) -> dict:
+    return {
+        "hidden_layer_sizes": tentativa.suggest_categorical("hidden_layer_sizes", [(50,), (100,), (50, 50), (100, 100), (50, 100), (100, 50)]),
+        "activation": tentativa.suggest_categorical("activation", ["relu", "tanh", "logistic"]),
+        "solver": tentativa.suggest_categorical("solver", ["adam", "sgd"]),
+        "alpha": tentativa.suggest_float("alpha", 1e-5, 1e-1, log=True),
+        "learning_rate": tentativa.suggest_categorical("learning_rate", ["constant", "invscaling", "adaptive"]),
+        "learning_rate_init": tentativa.suggest_float("learning_rate_init", 1e-4, 1e-1, log=True),
+        "max_iter": tentativa.suggest_int("max_iter", 50, 2000, log=True),
+        "tol": tentativa.suggest_float("tol", 1e-4, 1e-2, log=True)
+    }
+
+
+# Registro nome do modelo -> função que sorteia todos os hiperparâmetros de uma tentativa de uma só vez
+search_spaces_optuna = {
+    "decision_tree": sugerir_decision_tree,
+    "random_forest": sugerir_random_forest,
+    "naive_bayes": sugerir_naive_bayes,
+    "knn": sugerir_knn,
+    "svc": sugerir_svc,
+    "mlp": sugerir_mlp
 }
 
 
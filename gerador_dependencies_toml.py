@@ -1,9 +1,19 @@
-import toml
+import hashlib
+import os
 import re
+import threading
 import time
+import tomllib
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+# Padrões compilados uma única vez: o bloco "dependencies = [...]" e o cabeçalho da tabela [project]
+PADRAO_DEPENDENCIAS = re.compile(r'^dependencies\s*=\s*\[.*?\][ \t]*$', re.MULTILINE | re.DOTALL)
+PADRAO_PROJECT = re.compile(r'^\[project\][ \t]*$', re.MULTILINE)
+
+# Intervalo (em segundos) usado para agrupar os vários eventos que um editor dispara a cada salvamento
+INTERVALO_DEBOUNCE = 0.2
+
 
 def gerar_toml_atualizado():
     """
@@ -19,7 +29,8 @@ def gerar_toml_atualizado():
     """
     try:
         with open("pyproject.toml", "r", encoding="utf-8") as f:
-            pyproject = toml.load(f)
+            toml_str = f.read()
+        pyproject = tomllib.loads(toml_str)
     except Exception as erro_leitura_toml:
         print(f"[ERRO] Falha ao ler pyproject.toml: {erro_leitura_toml}")
         return
@@ -31,27 +42,20 @@ def gerar_toml_atualizado():
         print(f"[ERRO] Falha ao ler requirements.txt: {erro_leitura_reqs}")
         return
 
-    if "project" not in pyproject:
-        pyproject["project"] = {}
-
-    pyproject["project"]["dependencies"] = dependencias
+    # O texto original é mantido e apenas o bloco "dependencies" é substituído, sem reserializar o arquivo inteiro
+    deps_formatadas = ',\n    '.join(f'"{dep}"' for dep in dependencias)
+    bloco_dependencias = f'dependencies = [\n    {deps_formatadas}\n]'
 
     try:
-        toml_str = toml.dumps(pyproject)
-    except Exception as erro_dumps_toml:
-        print(f"[ERRO] Falha ao converter para TOML string: {erro_dumps_toml}")
-        return
-
-    padrao_regex = r'dependencies = \[(.*?)\]'
-    try:
-        if re.search(padrao_regex, toml_str, re.DOTALL):
-            deps_formatadas = ',\n    '.join(f'"{dep}"' for dep in dependencias)
-            toml_str = re.sub(
-                padrao_regex,
-                f'dependencies = [\n    {deps_formatadas}\n]',
-                toml_str,
-                flags=re.DOTALL
-            )
+        # Uma única passada: o subn já informa se o bloco existia, dispensando um re.search antes
+        toml_str, n_substituicoes = PADRAO_DEPENDENCIAS.subn(lambda _: bloco_dependencias, toml_str, count=1)
+        if n_substituicoes == 0:
+            if "dependencies" in pyproject.get("project", {}):
+                raise ValueError('bloco "dependencies" do [project] está num formato não reconhecido')
+            elif "project" in pyproject:
+                toml_str = PADRAO_PROJECT.sub(lambda m: f"{m.group(0)}\n{bloco_dependencias}", toml_str, count=1)
+            else:
+                toml_str = f"{toml_str.rstrip()}\n\n[project]\n{bloco_dependencias}\n"
     except Exception as erro_regex:
         print(f"[ERRO] Falha ao formatar dependências no TOML: {erro_regex}")
         return
@@ -64,14 +68,54 @@ def gerar_toml_atualizado():
 
 
 class RequisitosHandler(FileSystemEventHandler):
+    def __init__(self):
+        super().__init__()
+        self._timer = None
+        self._trava = threading.Lock()
+        self._caminho = None
+        self._ultima_assinatura = None
+        self._ultimo_hash = None
+
     def on_modified(self, event):
         if event.src_path.endswith("requirements.txt"):
-            try:
-                print("[INFO] Arquivo requirements.txt modificado. Atualizando pyproject.toml...")
-                gerar_toml_atualizado()
-                print("[INFO] pyproject.toml atualizado com sucesso.")
-            except Exception as erro_atualizacao:
-                print(f"[ERRO] Exceção durante atualização: {erro_atualizacao}")
+            # Reinicia o timer a cada evento, de modo que uma rajada de eventos gere uma única atualização
+            with self._trava:
+                self._caminho = event.src_path
+                if self._timer is not None:
+                    self._timer.cancel()
+                self._timer = threading.Timer(INTERVALO_DEBOUNCE, self._atualizar)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _conteudo_mudou(self) -> bool:
+        # Primeiro compara mtime/tamanho (barato); só se mudarem, compara o hash do conteúdo
+        try:
+            info = os.stat(self._caminho)
+            assinatura = (info.st_mtime_ns, info.st_size)
+            if assinatura == self._ultima_assinatura:
+                return False
+            with open(self._caminho, "rb") as f:
+                hash_conteudo = hashlib.md5(f.read()).hexdigest()
+        except OSError:
+            # Arquivo temporariamente ausente (ex: troca feita pelo editor): deixa o gerar_toml_atualizado reportar
+            return True
+
+        self._ultima_assinatura = assinatura
+        if hash_conteudo == self._ultimo_hash:
+            return False
+        self._ultimo_hash = hash_conteudo
+        return True
+
+    def _atualizar(self):
+        if not self._conteudo_mudou():
+            return
+
+        try:
+            print("[INFO] Arquivo requirements.txt modificado. Atualizando pyproject.toml...")
+            gerar_toml_atualizado()
+            print("[INFO] pyproject.toml atualizado com sucesso.")
+        except Exception as erro_atualizacao:
+            print(f"[ERRO] Exceção durante atualização: {erro_atualizacao}")
 
 
 if __name__ == "__main__":
@@ -1,17 +1,18 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import optuna
+from joblib import Parallel, delayed
+from sklearn.base import clone
 from sklearn.model_selection import StratifiedKFold
-from sklearn.metrics import (accuracy_score, 
-                             precision_score, 
-                             recall_score, 
-                             f1_score, 
+from sklearn.metrics import (auc,
                              confusion_matrix, 
-                             roc_auc_score, 
                              roc_curve,
                              precision_recall_fscore_support)
 
+# Pontos do eixo FPR sobre os quais a curva ROC de cada fold é interpolada na validação cruzada
+FPR_MEDIO = np.linspace(0, 1, 100)
+
 
 def avaliar_modelo(modelo, X_teste, y_teste, salvar_figuras=False, nomes_arquivos=None, exibir_figura=True):
     """
@@ -31,28 +32,35 @@ def avaliar_modelo(modelo, X_teste, y_teste, salvar_figuras=False, nomes_arquivo
         None
     """
     
-    # Realiza as previsões
-    y_pred = modelo.predict(X_teste)
-    y_prob = modelo.predict_proba(X_teste)[:, 1]
+    # Realiza as previsões: a classe predita sai das probabilidades, evitando um segundo passe com predict
+    probabilidades = modelo.predict_proba(X_teste)
+    y_prob = probabilidades[:, 1]
+    y_pred = modelo.classes_[probabilidades.argmax(axis=1)]
     
-    # Calcula e exibe métricas globais
-    acuracia = accuracy_score(y_teste, y_pred)
-    auc_roc = roc_auc_score(y_teste, y_prob)
+    # Calcula a matriz de confusão e as métricas por classe uma única vez; a acurácia sai da diagonal da matriz
+    matriz_confusao = confusion_matrix(y_teste, y_pred, labels=[0, 1])
+    precisao, recall, f1, _ = precision_recall_fscore_support(y_teste, y_pred, average=None, labels=[0, 1])
+    acuracia = np.trace(matriz_confusao) / matriz_confusao.sum()
+
+    # Calcula os pontos da curva ROC e obtém a AUC-ROC pela regra do trapézio sobre eles (sem reordenar y_prob de novo)
+    fpr, tpr, _ = roc_curve(y_teste, y_prob)
+    auc_roc = auc(fpr, tpr)
+
+    # Exibe métricas globais
     print(f"Acurácia: {acuracia:.4f}")
     print(f"AUC-ROC: {auc_roc:.4f}\n")
     
-    # Calcula e exibe métricas por classe
-    precisao = precision_score(y_teste, y_pred, average=None)
-    recall = recall_score(y_teste, y_pred, average=None)
-    f1 = f1_score(y_teste, y_pred, average=None)
-    
+    # Exibe métricas por classe
     print("Métricas de Classificação por Classe:")
     print(f"---Classe 0:\nPrecisão: {precisao[0]:.4f}\nRecall: {recall[0]:.4f}\nF1-Score: {f1[0]:.4f}")
     print(f"---Classe 1:\nPrecisão: {precisao[1]:.4f}\nRecall: {recall[1]:.4f}\nF1-Score: {f1[1]:.4f}\n")
     
     # Exibe a matriz de confusão
-    matriz_confusao = confusion_matrix(y_teste, y_pred)
     print("Matriz de Confusão:\n", matriz_confusao)
+
+    # Sem exibir nem salvar, as figuras seriam criadas e descartadas em seguida
+    if not (salvar_figuras or exibir_figura):
+        return
     
     # Plota a matriz de confusão e exibe em formato de gráfico
     plt.figure(figsize=(8, 6))
@@ -74,9 +82,6 @@ def avaliar_modelo(modelo, X_teste, y_teste, salvar_figuras=False, nomes_arquivo
     else:
         plt.close()
 
-    # Calcula os pontos para a curva ROC
-    fpr, tpr, _ = roc_curve(y_teste, y_prob)
-    
     # Plota o gráfico de exibição da AUC-ROC
     plt.figure(figsize=(8, 6))
     plt.plot(fpr, tpr, color='blue', label=f'AUC-ROC = {auc_roc:.4f}')
@@ -98,7 +103,107 @@ def avaliar_modelo(modelo, X_teste, y_teste, salvar_figuras=False, nomes_arquivo
     else:
         plt.close()
 
-def validador_cruzado(modelo, X, y, n_splits=5, exibir_resultados=True):
+def _matriz_confusao(y_real, y_predito, classes):
+    """
+    Calcula a matriz de confusão em uma única passada pelos rótulos, contando os pares (real, predito) com np.bincount.
+
+    Parâmetros:
+        y_real (np.ndarray): Rótulos verdadeiros.
+        y_predito (np.ndarray): Rótulos preditos.
+        classes (np.ndarray): Rótulos possíveis, ordenados (como retornado por np.unique).
+
+    Retorno:
+        np.ndarray: Matriz (n_classes x n_classes) com as linhas = real e colunas = predito, como no sklearn.
+    """
+    n_classes = classes.size
+    codigos_real = np.searchsorted(classes, y_real)
+    codigos_predito = np.searchsorted(classes, y_predito)
+    contagens = np.bincount(codigos_real * n_classes + codigos_predito, minlength=n_classes * n_classes)
+    return contagens.reshape(n_classes, n_classes)
+
+def _metricas_da_matriz(matriz):
+    """
+    Deriva acurácia, precisão, recall e F1-score por classe a partir da matriz de confusão, com as mesmas
+    convenções do sklearn (métrica = 0 quando o denominador é 0).
+
+    Parâmetros:
+        matriz (np.ndarray): Matriz de confusão (linhas = real, colunas = predito).
+
+    Retorno:
+        tuple: (acurácia, precisão por classe, recall por classe, F1-score por classe).
+    """
+    verdadeiros = np.diag(matriz).astype(np.float64)
+    total_predito = matriz.sum(axis=0)
+    total_real = matriz.sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        acuracia = verdadeiros.sum() / matriz.sum()
+        precisao = np.where(total_predito > 0, verdadeiros / total_predito, 0.0)
+        recall = np.where(total_real > 0, verdadeiros / total_real, 0.0)
+        denominador_f1 = total_predito + total_real
+        f1 = np.where(denominador_f1 > 0, 2 * verdadeiros / denominador_f1, 0.0)
+
+    return acuracia, precisao, recall, f1
+
+def _avaliar_fold(modelo, X, y, indices_treino, indices_teste, classes):
+    """
+    Treina um clone do modelo em um fold da validação cruzada e calcula as métricas no respectivo conjunto de teste.
+
+    Parâmetros:
+        modelo: Instância de classificador do scikit-learn (não é alterada).
+        X (np.ndarray): Conjunto de dados de entrada (features).
+        y (np.ndarray): Vetor de rótulos (targets).
+        indices_treino: Índices das amostras de treino do fold.
+        indices_teste: Índices das amostras de teste do fold.
+        classes: Rótulos considerados no cálculo das métricas por classe e da matriz de confusão.
+
+    Retorno:
+        tuple: (acurácia, AUC-ROC, TPR interpolado em FPR_MEDIO, precisão, recall, F1-score, matriz de confusão).
+        AUC-ROC e TPR são None quando o modelo não possui predict_proba.
+    """
+    X_treino, X_teste = X[indices_treino], X[indices_teste]
+    y_treino, y_teste = y[indices_treino], y[indices_teste]
+
+    # Clona o modelo para que folds executados em paralelo não compartilhem estado
+    modelo = clone(modelo)
+    modelo.fit(X_treino, y_treino)
+    if hasattr(modelo, 'predict_proba'):
+        probabilidades = modelo.predict_proba(X_teste)
+        y_probabilidade = probabilidades[:, 1]
+        y_predito = modelo.classes_[probabilidades.argmax(axis=1)]
+    else:
+        y_probabilidade = None
+        y_predito = modelo.predict(X_teste)
+
+    auc_roc, tpr_interpolado = None, None
+    if y_probabilidade is not None:
+        fpr, tpr, _ = roc_curve(y_teste, y_probabilidade)
+        auc_roc = auc(fpr, tpr)
+        tpr_interpolado = np.interp(FPR_MEDIO, fpr, tpr)
+
+    matriz = _matriz_confusao(y_teste, y_predito, classes)
+    acuracia, precisao, recall, f1 = _metricas_da_matriz(matriz)
+
+    return acuracia, auc_roc, tpr_interpolado, precisao, recall, f1, matriz
+
+def gerar_folds(y, n_splits=5):
+    """
+    Gera, uma única vez, os índices de treino/teste da validação cruzada estratificada usada em "validador_cruzado".
+    Útil quando a validação é repetida várias vezes sobre os mesmos dados (ex: dentro de um objetivo do optuna).
+
+    Parâmetros:
+        y: Vetor de rótulos (targets).
+        n_splits (int): Número de folds na validação cruzada.
+
+    Retorno:
+        list: Lista de tuplas (indices_treino, indices_teste), uma por fold.
+    """
+    kfold = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=2024)
+    y = y.to_numpy() if hasattr(y, 'to_numpy') else np.asarray(y)
+    # A estratificação depende apenas de y, então X pode ser substituído por um placeholder do mesmo tamanho
+    return list(kfold.split(np.zeros(len(y)), y))
+
+def validador_cruzado(modelo, X, y, n_splits=5, exibir_resultados=True, n_jobs=-1, tentativa=None, indices_folds=None):
     """
     Executa validação cruzada estratificada para modelos de classificação, tendo a mesma funcionalidade da função "avaliarModelo" mas
     aplicado aos folds feitos nos dados
@@ -109,6 +214,12 @@ def validador_cruzado(modelo, X, y, n_splits=5, exibir_resultados=True):
         y: Vetor de rótulos (targets).
         n_splits (int): Número de folds na validação cruzada.
         exibir_resultados (bool): Se True, imprime as métricas médias e desvios padrão.
+        n_jobs (int): Número de processos usados para executar os folds em paralelo (-1 = todos os núcleos).
+        tentativa (optuna.Trial, opcional): Se informada, a AUC-ROC média parcial é reportada após cada fold e a
+            tentativa é podada (optuna.TrialPruned) quando o pruner do estudo assim decidir. O estudo deve ser criado
+            com um pruner baseado em recursos, ex: optuna.pruners.HyperbandPruner(min_resource=1, max_resource=n_splits).
+        indices_folds (list, opcional): Folds pré-calculados com "gerar_folds", reaproveitados entre chamadas.
+            Quando informado, n_splits passa a ser o número de folds da lista.
 
     Returns:
         dict: Dicionário contendo as métricas:
@@ -121,66 +232,59 @@ def validador_cruzado(modelo, X, y, n_splits=5, exibir_resultados=True):
             'Curva ROC': (mean_fpr, mean_tpr, std_tpr)
     """
     
-    kfold = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=2024)
+    if indices_folds is None:
+        indices_folds = gerar_folds(y, n_splits)
+    n_splits = len(indices_folds)
 
-    lista_acuracia, lista_auc_roc = [], []
-    lista_precisao, lista_recall, lista_f1 = [], [], []
-    lista_matrizes = []
-    lista_fpr, lista_tpr = [], []
+    # Converte para numpy uma única vez, evitando o .iloc do pandas a cada fold
+    X = X.to_numpy() if hasattr(X, 'to_numpy') else np.asarray(X)
+    y = y.to_numpy() if hasattr(y, 'to_numpy') else np.asarray(y)
+    classes = np.unique(y)
 
-    for indices_treino, indices_teste in kfold.split(X, y):
-        if isinstance(X, pd.DataFrame):
-            X_treino, X_teste = X.iloc[indices_treino], X.iloc[indices_teste]
-            y_treino, y_teste = y.iloc[indices_treino], y.iloc[indices_teste]
-        else:
-            X_treino, X_teste = X[indices_treino], X[indices_teste]
-            y_treino, y_teste = y[indices_treino], y[indices_teste]
+    # Os folds são independentes entre si, então cada um é treinado/avaliado num processo separado.
+    # Com uma tentativa do optuna os folds rodam em sequência, para que a poda interrompa os folds restantes.
+    folds = Parallel(n_jobs=1 if tentativa is not None else n_jobs, prefer='processes', return_as='generator')(
+        delayed(_avaliar_fold)(modelo, X, y, indices_treino, indices_teste, classes)
+        for indices_treino, indices_teste in indices_folds
+    )
 
-        modelo.fit(X_treino, y_treino)
-        y_predito = modelo.predict(X_teste)
-        y_probabilidade = modelo.predict_proba(X_teste)[:, 1] if hasattr(modelo, 'predict_proba') else None
-
-        lista_acuracia.append(accuracy_score(y_teste, y_predito))
-        
-        if y_probabilidade is not None:
-            auc_roc = roc_auc_score(y_teste, y_probabilidade)
-            lista_auc_roc.append(auc_roc)
-            fpr, tpr, _ = roc_curve(y_teste, y_probabilidade)
-            lista_fpr.append(fpr)
-            lista_tpr.append(tpr)
-        
-        precisao, recall, f1, _ = precision_recall_fscore_support(
-            y_teste, y_predito, average=None, labels=np.unique(y)
-        )
-        lista_precisao.append(precisao)
-        lista_recall.append(recall)
-        lista_f1.append(f1)
-        lista_matrizes.append(confusion_matrix(y_teste, y_predito))
-
-    matriz_media = np.mean(lista_matrizes, axis=0)
-    matriz_std = np.std(lista_matrizes, axis=0)
+    # Buffers pré-alocados (um fold por linha), preenchidos por índice à medida que os folds terminam.
+    # Modelos sem predict_proba não geram AUC-ROC nem curva ROC.
+    possui_proba = hasattr(modelo, 'predict_proba')
+    n_classes = classes.size
+    acuracias = np.empty(n_splits, dtype=np.float64)
+    aucs_roc = np.empty(n_splits, dtype=np.float64) if possui_proba else None
+    matriz_tpr = np.empty((n_splits, FPR_MEDIO.size), dtype=np.float64) if possui_proba else None
+    precisoes = np.empty((n_splits, n_classes), dtype=np.float64)
+    recalls = np.empty((n_splits, n_classes), dtype=np.float64)
+    f1s = np.empty((n_splits, n_classes), dtype=np.float64)
+    matrizes = np.empty((n_splits, n_classes, n_classes), dtype=np.int64)
 
-    
-    media_auc_roc = np.mean(lista_auc_roc)
-    desvio_auc_roc = np.std(lista_auc_roc)
+    for i, (acuracia, auc_roc, tpr, precisao, recall, f1, matriz) in enumerate(folds):
+        acuracias[i] = acuracia
+        if possui_proba:
+            aucs_roc[i] = auc_roc
+            matriz_tpr[i] = tpr
+        precisoes[i] = precisao
+        recalls[i] = recall
+        f1s[i] = f1
+        matrizes[i] = matriz
 
-    mean_fpr = np.linspace(0, 1, 100)
-    mean_tpr_interp = np.zeros_like(mean_fpr)
-    
-    for i in range(len(lista_fpr)):
-        mean_tpr_interp += np.interp(mean_fpr, lista_fpr[i], lista_tpr[i])
-    mean_tpr_interp /= len(lista_fpr)
-    
-    std_tpr = np.std([np.interp(mean_fpr, fpr, tpr) for fpr, tpr in zip(lista_fpr, lista_tpr)], axis=0)
+        if tentativa is not None:
+            # Reporta a AUC-ROC média parcial (ou a acurácia, se o modelo não tiver predict_proba)
+            valor_parcial = aucs_roc[:i + 1].mean() if possui_proba else acuracias[:i + 1].mean()
+            tentativa.report(valor_parcial, step=i + 1)
+            if tentativa.should_prune():
+                raise optuna.TrialPruned()
 
     resultados = {
-        'Acurácia': (np.mean(lista_acuracia), np.std(lista_acuracia)),
-        'AUC-ROC': (media_auc_roc, desvio_auc_roc) if lista_auc_roc else (None, None),
-        'Precisão': (np.mean(lista_precisao, axis=0), np.std(lista_precisao, axis=0)),
-        'Recall': (np.mean(lista_recall, axis=0), np.std(lista_recall, axis=0)),
-        'F1-Score': (np.mean(lista_f1, axis=0), np.std(lista_f1, axis=0)),
-        'Matriz de Confusão': (matriz_media, matriz_std),
-        'Curva ROC': (mean_fpr, mean_tpr_interp, std_tpr)
+        'Acurácia': (acuracias.mean(), acuracias.std()),
+        'AUC-ROC': (aucs_roc.mean(), aucs_roc.std()) if possui_proba else (None, None),
+        'Precisão': (precisoes.mean(axis=0), precisoes.std(axis=0)),
+        'Recall': (recalls.mean(axis=0), recalls.std(axis=0)),
+        'F1-Score': (f1s.mean(axis=0), f1s.std(axis=0)),
+        'Matriz de Confusão': (matrizes.mean(axis=0), matrizes.std(axis=0)),
+        'Curva ROC': (FPR_MEDIO, matriz_tpr.mean(axis=0), matriz_tpr.std(axis=0)) if possui_proba else (None, None, None)
     }
 
     if exibir_resultados:
@@ -1,11 +1,15 @@
 import os
 import glob
+import logging
 import pandas as pd
 import numpy as np
 import warnings
 from typing import Callable, Dict, Any, List, Tuple
-from itables import init_notebook_mode
-from config.feriados import obter_feriados_ano
+from config.feriados import em_feriado, obter_feriados_ano
+
+# Mensagens dos caminhos críticos (por arquivo/por linha) vão para o logging em vez do print: sem handler configurado
+# só avisos são exibidos, e mensagens desabilitadas não chegam a ser formatadas
+logger = logging.getLogger(__name__)
 
 def carregar_datasets(caminho: str, configs: dict) -> pd.DataFrame:
     """
@@ -13,7 +17,7 @@ def carregar_datasets(caminho: str, configs: dict) -> pd.DataFrame:
 
     Parâmetros:
         caminho (str): Caminho do diretório onde os arquivos CSV estão localizados.
-        configs (dict): Dicionário com as configurações do pd.read_csv.
+        configs (dict): Dicionário com as configurações do pd.read_csv (engine, usecols, dtype, etc.).
 
     Retorna:
         pd.DataFrame: DataFrame resultante da concatenação vertical dos arquivos.
@@ -27,14 +31,50 @@ def carregar_datasets(caminho: str, configs: dict) -> pd.DataFrame:
     dataframes = []
 
     for arquivo in lista_arquivos:
-        print(f"Lendo arquivo: {arquivo}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Lendo arquivo: %s", arquivo)
         df = pd.read_csv(arquivo, **configs)
         dataframes.append(df)
 
+    # Com um único arquivo não há o que concatenar, e o pd.concat faria apenas uma cópia extra dos dados
+    if len(dataframes) == 1:
+        return dataframes[0]
+
     df_concatenado = pd.concat(dataframes, axis=0, ignore_index=True)
 
     return df_concatenado
 
+def otimiza_dtypes(df: pd.DataFrame, limite_cardinalidade: float = 0.5) -> pd.DataFrame:
+    """
+    Reduz o uso de memória do DataFrame logo após a leitura:
+    - inteiros e floats são convertidos para o menor tipo que comporta os valores (downcast);
+    - colunas de texto com poucos valores distintos (nunique / nº de linhas < limite_cardinalidade) viram 'category'.
+
+    Parâmetros:
+        df (pd.DataFrame): DataFrame a ser otimizado.
+        limite_cardinalidade (float): Proporção máxima de valores distintos para converter uma coluna em 'category'.
+
+    Retorna:
+        pd.DataFrame: DataFrame com os tipos otimizados.
+    """
+    memoria_antes = df.memory_usage(deep=True).sum()
+    n_linhas = max(len(df), 1)
+
+    for coluna in df.columns:
+        tipo = df[coluna].dtype
+        if pd.api.types.is_integer_dtype(tipo):
+            df[coluna] = pd.to_numeric(df[coluna], downcast='integer')
+        elif pd.api.types.is_float_dtype(tipo):
+            df[coluna] = pd.to_numeric(df[coluna], downcast='float')
+        elif pd.api.types.is_object_dtype(tipo):
+            if df[coluna].nunique(dropna=False) / n_linhas < limite_cardinalidade:
+                df[coluna] = df[coluna].astype('category')
+
+    memoria_depois = df.memory_usage(deep=True).sum()
+    print(f"Memória do DataFrame: {memoria_antes / 1024 ** 2:.2f} MB -> {memoria_depois / 1024 ** 2:.2f} MB")
+
+    return df
+
 def caminho_saida_figura(nome_arquivo: str) -> str:
     """
     Retorna o caminho completo para salvar figuras no diretório 'figs'.
@@ -47,13 +87,17 @@ def caminho_saida_figura(nome_arquivo: str) -> str:
     """
     return os.path.join("figs", nome_arquivo)
 
-def configurar_ambiente() -> None:
+def configurar_ambiente(tabelas_interativas: bool = False) -> None:
     """
     Configura o ambiente de execução do notebook:
     - Exibe todas as colunas de DataFrames do pandas.
     - Formata números em ponto flutuante com três casas decimais.
     - Oculta warnings desnecessários.
-    - Ativa o modo interativo do itables para exibição de tabelas HTML.
+    - Opcionalmente, ativa o modo interativo do itables para exibição de tabelas HTML.
+
+    Parâmetros:
+        tabelas_interativas (bool): Se True, todo DataFrame exibido passa pelo itables. Fica desligado por padrão,
+            pois o itables serializa o DataFrame inteiro para o navegador (para exibir uma amostra, use "mostrar").
 
     Retorna:
         None
@@ -62,7 +106,9 @@ def configurar_ambiente() -> None:
         pd.set_option('display.max_columns', None)
         pd.set_option('display.float_format', lambda x: '%.3f' % x)
         warnings.filterwarnings("ignore")
-        init_notebook_mode(all_interactive=True)
+        if tabelas_interativas:
+            from itables import init_notebook_mode
+            init_notebook_mode(all_interactive=True)
     except (AttributeError, ImportError) as e:
         print(f"[Erro] Falha ao configurar ambiente — problema com dependências ou atributos: {e}")
         raise
@@ -70,6 +116,20 @@ def configurar_ambiente() -> None:
         print(f"[Erro] Erro inesperado ao configurar ambiente: {e}")
         raise
 
+def mostrar(df: pd.DataFrame, max_linhas: int = 1000) -> None:
+    """
+    Exibe as primeiras linhas do DataFrame como tabela interativa do itables, sem serializar o DataFrame inteiro.
+
+    Parâmetros:
+        df (pd.DataFrame): DataFrame a ser exibido.
+        max_linhas (int): Número máximo de linhas enviadas para a tabela.
+
+    Retorna:
+        None
+    """
+    from itables import show
+    show(df.head(max_linhas))
+
 def eh_feriado(row: pd.Series) -> int:
     """
     Verifica se a data da linha é um feriado nacional brasileiro.
@@ -81,38 +141,69 @@ def eh_feriado(row: pd.Series) -> int:
         int: 1 se a data for feriado, 0 caso contrário.
     """
     try:
-        data = pd.to_datetime(row['data_inversa']).normalize()
+        # Formato fixo: o parser não precisa adivinhar o formato da data a cada linha
+        data = pd.to_datetime(row['data_inversa'], format='%Y-%m-%d', cache=True).normalize()
         ano = data.year
-        feriados = obter_feriados_ano(ano)
+        feriados = obter_feriados_ano(ano)  # calculado uma única vez por ano (lru_cache em config.feriados)
         return int(data in feriados)
     except KeyError:
-        print(f"[Erro] Coluna 'data_inversa' ausente na linha {row.name}")
+        logger.debug("Coluna 'data_inversa' ausente na linha %s", row.name)
         return 0
     except Exception as e:
-        print(f"[Erro] Falha ao verificar feriado na linha {row.name}: {e}")
+        logger.debug("Falha ao verificar feriado na linha %s: %s", row.name, e)
         return 0
 
+def marca_feriado(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cria a coluna 'emFeriado', indicando se a data do acidente é um feriado nacional brasileiro.
+    Versão vetorizada do "eh_feriado": a coluna 'data_inversa' é convertida uma única vez e a verificação
+    é feita para todas as linhas de uma só vez.
+
+    Parâmetros:
+        df (pd.DataFrame): DataFrame contendo a coluna 'data_inversa'.
+
+    Retorna:
+        pd.DataFrame: DataFrame original com a coluna 'emFeriado' adicionada (1 se feriado, 0 caso contrário).
+    """
+    if 'data_inversa' not in df.columns:
+        raise KeyError("Coluna 'data_inversa' não encontrada no DataFrame")
+
+    try:
+        datas = pd.to_datetime(df['data_inversa'], format='%Y-%m-%d', errors='coerce', cache=True)
+        invalidas = int((datas.isna() & df['data_inversa'].notna()).sum())
+        if invalidas:
+            logger.warning("%d data(s) inválida(s) em 'data_inversa'. Marcadas como não feriado.", invalidas)
+        df['emFeriado'] = em_feriado(datas).astype('int8')
+        return df
+    except Exception as e:
+        print(f"[Erro] Erro inesperado ao marcar feriados: {e}")
+        raise
+
 def mapeador(dicionario: Dict[Tuple[Any, ...], Any]) -> Callable[[Any], Any]:
     """
     Cria uma função de mapeamento baseada em um dicionário de tuplas como chaves.
+    O dicionário é achatado uma única vez (cada valor da tupla vira uma chave), de modo que cada consulta é um
+    acesso direto ao dicionário, em vez de percorrer todas as tuplas.
 
     Parâmetros:
         dicionario (Dict[Tuple[Any, ...], Any]): Dicionário onde as chaves são tuplas e os valores são categorias.
 
     Retorna:
-        Callable[[Any], Any]: Função que mapeia um valor individual para sua categoria.
+        Callable[[Any], Any]: Função que mapeia um valor individual para sua categoria (None se não mapeado).
+        Se receber uma pd.Series, mapeia a coluna inteira de uma vez com Series.map (NaN se não mapeado).
     """
+    achatado = {chave: resultado for chaves, resultado in dicionario.items() for chave in chaves}
+
     def mapper(valor: Any) -> Any:
+        if isinstance(valor, pd.Series):
+            return valor.map(achatado)
         try:
-            for chaves, resultado in dicionario.items():
-                if valor in chaves:
-                    return resultado
-            return None
+            return achatado.get(valor)
         except TypeError as e:
-            print(f"[Erro] Tipo inválido no mapeamento do valor '{valor}': {e}")
+            logger.debug("Tipo inválido no mapeamento do valor '%s': %s", valor, e)
             return None
         except Exception as e:
-            print(f"[Erro] Erro inesperado no mapeamento do valor '{valor}': {e}")
+            logger.debug("Erro inesperado no mapeamento do valor '%s': %s", valor, e)
             return None
 
     return mapper
@@ -172,6 +263,8 @@ def extrair_categorias_tracado(tracado: str) -> pd.Series:
 def categoriza_tracado_via(df: pd.DataFrame) -> pd.DataFrame:
     """
     Aplica a extração de categorias do traçado da via em todas as linhas do DataFrame.
+    Segue as mesmas regras de "extrair_categorias_tracado", mas de forma vetorizada (Series.str.contains sobre
+    a coluna inteira), sem criar uma pd.Series por linha.
 
     Parâmetros:
         df (pd.DataFrame): DataFrame contendo a coluna 'tracado_via'.
@@ -180,9 +273,34 @@ def categoriza_tracado_via(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame original com as colunas adicionais [condicaoPista, tipoInclinacao, tipoSuperficie, tipoManobra, tipoEstrutura].
     """
     try:
-        df[['condicaoPista', 'tipoInclinacao', 'tipoSuperficie', 'tipoManobra', 'tipoEstrutura']] = (
-            df['tracado_via'].apply(extrair_categorias_tracado)
+        tracado = df['tracado_via']
+
+        # Em colunas 'category' basta validar as categorias (e a ausência de nulos), não cada linha
+        valores = tracado.cat.categories if isinstance(tracado.dtype, pd.CategoricalDtype) else tracado
+        if len(tracado) and (tracado.hasnans or pd.api.types.infer_dtype(valores, skipna=False) != 'string'):
+            invalido = next(valor for valor in tracado if not isinstance(valor, str))
+            raise TypeError(f"Valor esperado do tipo str para 'tracado_via', recebido {type(invalido)}")
+
+        def contem(trecho: str) -> np.ndarray:
+            return tracado.str.contains(trecho, regex=False).to_numpy()
+
+        df['condicaoPista'] = np.where(contem('Em Obras') | contem('Desvio Temporário'), 'Em obras', 'Normal')
+        df['tipoInclinacao'] = np.select([contem('Aclive'), contem('Declive')], ['Aclive', 'Declive'], 'Plano')
+        df['tipoSuperficie'] = np.where(contem('Curva'), 'Curva', 'Reta')
+        df['tipoManobra'] = np.select(
+            [contem('Rotatória'), contem('Interseção'), contem('Retorno Regulamentado')],
+            ['Rotatória', 'Interseção', 'Retorno Regulamentado'],
+            'Nenhum'
+        )
+        df['tipoEstrutura'] = np.select(
+            [contem('Ponte'), contem('Túnel'), contem('Viaduto')],
+            ['Ponte', 'Túnel', 'Viaduto'],
+            'Nenhum'
         )
+
+        # O np.where/np.select devolvem strings numpy; volta para object, que é o que o restante do fluxo espera
+        colunas = ['condicaoPista', 'tipoInclinacao', 'tipoSuperficie', 'tipoManobra', 'tipoEstrutura']
+        df[colunas] = df[colunas].astype(object)
         return df
     except KeyError as e:
         print(f"[Erro] Coluna 'tracado_via' não encontrada no DataFrame: {e}")
@@ -204,7 +322,7 @@ def converte_features_ciclicas(df: pd.DataFrame, colunas: List[str], valores_max
         valores_maximos (List[int]): Lista de valores máximos para cada coluna (ex: 24 para hora).
 
     Retorna:
-        pd.DataFrame: DataFrame com as colunas cíclicas convertidas em componentes senoides.
+        pd.DataFrame: DataFrame com as colunas cíclicas convertidas em componentes senoides (float32).
     """
     try:
         for coluna, valorMaximo in zip(colunas, valores_maximos):
@@ -215,8 +333,11 @@ def converte_features_ciclicas(df: pd.DataFrame, colunas: List[str], valores_max
             if not np.issubdtype(df[coluna].dtype, np.number):
                 raise TypeError(f"Coluna '{coluna}' deve ser numérica para conversão cíclica")
 
-            df[coluna + 'Sen'] = np.sin(2 * np.pi * df[coluna] / valorMaximo)
-            df[coluna + 'Cos'] = np.cos(2 * np.pi * df[coluna] / valorMaximo)
+            # O ângulo é calculado uma única vez e reaproveitado pelo seno e pelo cosseno (float32 basta aqui)
+            escala = np.float32(2 * np.pi / valorMaximo)
+            angulo = df[coluna].to_numpy(dtype=np.float32) * escala
+            df[coluna + 'Sen'] = np.sin(angulo)
+            df[coluna + 'Cos'] = np.cos(angulo)
             df.drop(coluna, axis=1, inplace=True)
         return df
     except TypeError as e:
@@ -229,6 +350,8 @@ def converte_features_ciclicas(df: pd.DataFrame, colunas: List[str], valores_max
 def remove_outliers(df: pd.DataFrame, colunas: List[str], contar_outliers: bool = False) -> pd.DataFrame:
     """
     Remove outliers de colunas numéricas com base na regra do IQR (1.5 * intervalo interquartil).
+    Os limites de todas as colunas são calculados sobre o DataFrame recebido e o filtro é aplicado uma única vez,
+    com uma máscara combinada (uma linha é removida se for outlier em qualquer uma das colunas).
 
     Parâmetros:
         df (pd.DataFrame): DataFrame contendo as colunas.
@@ -238,23 +361,23 @@ def remove_outliers(df: pd.DataFrame, colunas: List[str], contar_outliers: bool
     Retorna:
         pd.DataFrame: DataFrame com outliers removidos.
     """
-    outliers_count = {}  # Dicionário para armazenar a contagem de outliers por coluna
+    valores = df[colunas]
 
-    for coluna in colunas:
-        Q1 = df[coluna].quantile(0.25)
-        Q3 = df[coluna].quantile(0.75)
-        IQR = Q3 - Q1
-        limite_inferior = Q1 - 1.5 * IQR
-        limite_superior = Q3 + 1.5 * IQR
+    # Quartis de todas as colunas em uma única chamada
+    quartis = valores.quantile([0.25, 0.75])
+    Q1, Q3 = quartis.loc[0.25], quartis.loc[0.75]
+    IQR = Q3 - Q1
+    limite_inferior = Q1 - 1.5 * IQR
+    limite_superior = Q3 + 1.5 * IQR
 
-        if contar_outliers:
-            outliers_count[coluna] = ((df[coluna] < limite_inferior) | (df[coluna] > limite_superior)).sum()
+    dentro_limites = (valores >= limite_inferior) & (valores <= limite_superior)
 
-        # Removendo os outliers
-        df = df[(df[coluna] >= limite_inferior) & (df[coluna] <= limite_superior)]
-
-    # Retorna os dados filtrados e a contagem de outliers (se solicitado)
-    return (df, outliers_count) if contar_outliers else df
+    # Retorna os dados filtrados e a contagem de outliers por coluna (se solicitado)
+    df_filtrado = df[dentro_limites.all(axis=1)]
+    if contar_outliers:
+        outliers_count = ((valores < limite_inferior) | (valores > limite_superior)).sum().to_dict()
+        return df_filtrado, outliers_count
+    return df_filtrado
 
 def define_gravidade(row: pd.Series) -> int:
     """
@@ -279,37 +402,60 @@ def define_gravidade(row: pd.Series) -> int:
         else:
             return 0
     except (ValueError, TypeError) as e:
-        print(f"[Erro] Dados inválidos para definir gravidade na linha {row.name}: {e}")
+        logger.debug("Dados inválidos para definir gravidade na linha %s: %s", row.name, e)
         return 0
     except Exception as e:
-        print(f"[Erro] Erro inesperado ao definir gravidade na linha {row.name}: {e}")
+        logger.debug("Erro inesperado ao definir gravidade na linha %s: %s", row.name, e)
         return 0
 
-def define_fase_do_dia(coluna: List[int]) -> List[str]:
+def define_gravidade_vetorizado(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Versão vetorizada do "define_gravidade": cria a coluna 'gravidade' para todas as linhas de uma só vez.
+    Como feridos leves e ilesos nunca tornam o acidente grave, apenas 'mortos' e 'feridos_graves' são avaliados.
+
+    Parâmetros:
+        df (pd.DataFrame): DataFrame contendo as colunas 'mortos' e 'feridos_graves'. Colunas ausentes e
+            valores nulos ou inválidos são tratados como 0, assim como na versão por linha.
+
+    Retorna:
+        pd.DataFrame: DataFrame original com a coluna 'gravidade' (int8) adicionada: 1 para acidentes graves,
+        0 para não-graves.
+    """
+    def vitimas(coluna: str) -> pd.Series:
+        if coluna not in df.columns:
+            return pd.Series(0, index=df.index)
+        valores = pd.to_numeric(df[coluna], errors='coerce')
+        invalidos = int((valores.isna() & df[coluna].notna()).sum())
+        if invalidos:
+            logger.warning("%d valor(es) inválido(s) em '%s'. Tratados como 0.", invalidos, coluna)
+        return valores.fillna(0)
+
+    df['gravidade'] = ((vitimas('mortos') > 0) | (vitimas('feridos_graves') > 0)).astype('int8')
+    return df
+
+def define_fase_do_dia(coluna: List[int]) -> np.ndarray:
     """
-    Determina a fase do dia (Dia ou Noite) com base na hora informada.
+    Determina a fase do dia (Dia ou Noite) com base na hora informada, de forma vetorizada.
 
     Parâmetros:
-        coluna (List[int]): Lista com valores de hora (0-23).
+        coluna (List[int]): Lista (ou Series/array) com valores de hora (0-23).
 
     Retorna:
-        List[str]: Lista com as fases do dia correspondentes ('Dia', 'Noite', 'Desconhecido').
+        np.ndarray: Array (dtype object) com as fases do dia correspondentes ('Dia', 'Noite', 'Desconhecido').
+        Valores não numéricos ou nulos resultam em 'Desconhecido'.
     """
     try:
-        fase = []
-        for i, hora in enumerate(coluna):
-            if not isinstance(hora, (int, float)):
-                print(f"[Aviso] Valor inválido para hora na posição {i}: {hora}. Definindo fase como 'Desconhecido'.")
-                fase.append('Desconhecido')
-                continue
-            if 6 < hora < 18:
-                fase.append('Dia')
-            else:
-                fase.append('Noite')
+        horas = pd.to_numeric(pd.Series(coluna), errors='coerce').to_numpy(dtype=np.float64)
+        invalidos = np.isnan(horas)
+        if invalidos.any():
+            logger.warning("%d valor(es) inválido(s) para hora. Definindo fase como 'Desconhecido'.", invalidos.sum())
+
+        fase = np.where((horas > 6) & (horas < 18), 'Dia', 'Noite').astype(object)
+        fase[invalidos] = 'Desconhecido'
         return fase
     except Exception as e:
         print(f"[Erro] Erro inesperado ao definir fase do dia para valores {coluna}: {e}")
-        return ['Desconhecido' for _ in coluna]
+        return np.full(len(coluna), 'Desconhecido', dtype=object)
 
 def calcular_frequencia_acidente(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -319,13 +465,33 @@ def calcular_frequencia_acidente(df: pd.DataFrame) -> pd.DataFrame:
         df (pd.DataFrame): DataFrame contendo as colunas 'id', 'br', 'km'.
 
     Retorna:
-        pd.DataFrame: DataFrame original com a coluna 'frequenciaAcidente' adicionada.
+        pd.DataFrame: DataFrame original com a coluna 'frequenciaAcidente' (float32) adicionada e 'br' como
+        categoria (inteiros).
     """
     n = len(df)
 
-    df[['br', 'km']] = df[['br', 'km']].replace(',', '.', regex=True).astype(float).astype(int)
-    df['frequenciaAcidente'] = df.groupby(['br', 'km'])['id'].transform('count') / n
-
-    df['br'] = df['br'].astype(str)
+    def para_inteiro(serie: pd.Series) -> np.ndarray:
+        # Colunas já numéricas dispensam a troca de vírgula decimal; as textuais usam replace literal (sem regex)
+        if not pd.api.types.is_numeric_dtype(serie):
+            serie = serie.astype(str).str.replace(',', '.', regex=False)
+        return serie.astype(float).astype(int).to_numpy()
+
+    br = para_inteiro(df['br'])
+    km = para_inteiro(df['km'])
+    df['br'] = br
+    df['km'] = km
+
+    # Cada par (br, km) vira um código inteiro; a contagem por grupo sai de um único np.bincount
+    codigos_br, _ = pd.factorize(br)
+    codigos_km, valores_km = pd.factorize(km)
+    codigos, _ = pd.factorize(codigos_br.astype(np.int64) * len(valores_km) + codigos_km)
+    contagens = np.bincount(codigos, weights=df['id'].notna().to_numpy())  # mesmo critério do 'count' (ignora id nulo)
+    # Frequências ficam em [0, 1]: float32 basta, e a divisão por n vira uma multiplicação pelo inverso pré-calculado
+    inverso_n = np.float32(1.0 / max(n, 1))
+    df['frequenciaAcidente'] = contagens.astype(np.float32)[codigos] * inverso_n
+
+    # 'br' é um rótulo (é codificado depois como categoria): guarda os inteiros e um pequeno dicionário de categorias,
+    # em vez de uma string Python por linha
+    df['br'] = pd.Categorical(br)
 
     return df
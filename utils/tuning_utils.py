@@ -1,6 +1,7 @@
-from sklearn.model_selection import KFold
+import numpy as np
+from sklearn.model_selection import KFold, cross_val_score
 from sklearn.metrics import accuracy_score
-from functools import partial
+from functools import partial, lru_cache
 from datetime import datetime
 import optuna
 from skopt import BayesSearchCV
@@ -63,31 +64,97 @@ def objetivo_skopt(classe_modelo, espaco_busca, X, y, n_iteracoes: int, metrica:
         raise
 
 
-def objetivo_optuna(tentativa, classe_modelo, nome_modelo: str, espacos_busca_optuna: dict,
-                    X_treino, y_treino, X_validacao, y_validacao) -> float:
+def acuracia_por_fold_em_cache(classe_modelo, X_treino, y_treino, divisoes: list, tamanho_cache: int = 1024):
     """
-    Função de objetivo para a otimização com Optuna.
+    Cria a função que treina e avalia um conjunto de parâmetros em um fold, memorizando o resultado.
+    Os dados de treino/validação de cada fold são separados uma única vez, na criação da função.
+    O sampler do Optuna costuma repetir combinações (principalmente em espaços com muitos inteiros e categóricos);
+    com o cache, uma combinação (fold, parâmetros) já avaliada não é treinada de novo.
+
+    Parâmetros:
+        classe_modelo: Classe do modelo (ex: RandomForestClassifier).
+        X_treino, y_treino (np.ndarray): Dados de treino já convertidos para arrays NumPy (indexação direta por fold).
+        divisoes (list): Lista de pares (indice_treino, indice_validacao) de cada fold.
+        tamanho_cache (int): Número máximo de resultados mantidos no cache (LRU).
+
+    Retorna:
+        Callable[[int, tuple], float]: Função (fold_id, parâmetros ordenados como tupla de pares) -> acurácia no fold.
+    """
+    # Os recortes de cada fold são materializados uma única vez e reaproveitados por todas as tentativas
+    folds = [(X_treino[indice_treino], y_treino[indice_treino], X_treino[indice_validacao], y_treino[indice_validacao])
+             for indice_treino, indice_validacao in divisoes]
+
+    @lru_cache(maxsize=tamanho_cache)
+    def acuracia_fold(fold_id: int, parametros: tuple) -> float:
+        X_tr, y_tr, X_val, y_val = folds[fold_id]
+
+        modelo = classe_modelo(**dict(parametros))
+        modelo.fit(X_tr, y_tr)
+        return accuracy_score(y_val, modelo.predict(X_val))
+
+    return acuracia_fold
+
+
+def acuracia_media_em_cache(classe_modelo, X_treino, y_treino, divisoes: list, n_jobs: int = -1,
+                            tamanho_cache: int = 1024):
+    """
+    Variante de "acuracia_por_fold_em_cache" que avalia todos os folds de uma vez com o cross_val_score, treinando
+    os folds em paralelo (joblib). Como os folds terminam juntos, não há resultado parcial para o pruner.
 
     Parâmetros:
-        tentativa: Objeto de tentativa do Optuna.
         classe_modelo: Classe do modelo (ex: RandomForestClassifier).
-        nome_modelo (str): Nome do modelo.
-        espacos_busca_optuna (dict): Espaços de busca definidos para o Optuna.
         X_treino, y_treino: Dados de treino.
-        X_validacao, y_validacao: Dados de validação.
+        divisoes (list): Lista de pares (indice_treino, indice_validacao) de cada fold.
+        n_jobs (int): Número de folds treinados em paralelo (default = -1, todos os núcleos).
+        tamanho_cache (int): Número máximo de resultados mantidos no cache (LRU).
 
     Retorna:
-        float: A acurácia do modelo com os parâmetros testados.
+        Callable[[tuple], float]: Função (parâmetros ordenados como tupla de pares) -> acurácia média nos folds.
+    """
+    @lru_cache(maxsize=tamanho_cache)
+    def acuracia_media(parametros: tuple) -> float:
+        acuracias = cross_val_score(classe_modelo(**dict(parametros)), X_treino, y_treino,
+                                    cv=divisoes, scoring="accuracy", n_jobs=n_jobs)
+        return float(acuracias.mean())
+
+    return acuracia_media
+
+
+def objetivo_optuna(tentativa, nome_modelo: str, espacos_busca_optuna: dict, acuracia_fold, n_folds: int,
+                    acuracia_media=None) -> float:
+    """
+    Função de objetivo para a otimização com Optuna: avalia os parâmetros sorteados em todos os folds.
+    A acurácia média parcial é reportada após cada fold, para que o pruner do estudo possa interromper tentativas
+    ruins antes de treinar os folds restantes. Se "acuracia_media" for informada, os folds são avaliados de uma
+    só vez (em paralelo) e não há poda entre eles.
+
+    Parâmetros:
+        tentativa: Objeto de tentativa do Optuna.
+        nome_modelo (str): Nome do modelo.
+        espacos_busca_optuna (dict): Funções de sugestão de hiperparâmetros do Optuna, indexadas pelo nome do modelo.
+        acuracia_fold: Função (fold_id, parâmetros) -> acurácia, criada por "acuracia_por_fold_em_cache".
+        n_folds (int): Número de folds.
+        acuracia_media (opcional): Função (parâmetros) -> acurácia média, criada por "acuracia_media_em_cache".
+
+    Retorna:
+        float: A acurácia média do modelo nos folds com os parâmetros testados.
     """
     try:
-        parametros = {
-            hiperparametro: gerador(tentativa)
-            for hiperparametro, gerador in espacos_busca_optuna[nome_modelo].items()
-        }
-        modelo = classe_modelo(**parametros)
-        modelo.fit(X_treino, y_treino)
-        y_predito = modelo.predict(X_validacao)
-        return accuracy_score(y_validacao, y_predito)
+        parametros = espacos_busca_optuna[nome_modelo](tentativa)
+        chave_parametros = tuple(sorted(parametros.items()))
+        if acuracia_media is not None:
+            return acuracia_media(chave_parametros)
+
+        acuracias = []
+        for fold_id in range(n_folds):
+            acuracias.append(acuracia_fold(fold_id, chave_parametros))
+
+            tentativa.report(float(np.mean(acuracias)), step=fold_id + 1)
+            if tentativa.should_prune():
+                raise optuna.TrialPruned()
+        return float(np.mean(acuracias))
+    except optuna.TrialPruned:
+        raise
     except Exception as erro:
         print(f"Erro durante a execução do Optuna: {erro}")
         raise
@@ -100,7 +167,9 @@ def tunar_modelo(nome_modelo: str,
                  n_iteracoes: int,
                  espacos_busca_optuna: dict = None,
                  espaco_busca_skopt: dict = None,
-                 metodo: str = "optuna") -> dict:
+                 metodo: str = "optuna",
+                 n_jobs: int = -1,
+                 n_jobs_folds: int = 1) -> dict:
     """
     Executa a otimização de hiperparâmetros utilizando Optuna ou skopt.
 
@@ -110,9 +179,12 @@ def tunar_modelo(nome_modelo: str,
         X_treino: Conjunto de atributos de treino.
         y_treino: Conjunto de rótulos de treino.
         n_iteracoes (int): Número de iterações ou tentativas da busca.
-        espacos_busca_optuna (dict, opcional): Espaço de busca de hiperparâmetros para Optuna.
+        espacos_busca_optuna (dict, opcional): Funções de sugestão de hiperparâmetros do Optuna, indexadas pelo nome do modelo.
         espaco_busca_skopt (dict, opcional): Espaço de busca de hiperparâmetros para skopt.
         metodo (str): Método de tuning a ser utilizado ("optuna" ou "skopt").
+        n_jobs (int): Número de tentativas do Optuna executadas em paralelo (default = -1, todos os núcleos).
+        n_jobs_folds (int): Se diferente de 1, os folds de cada tentativa são treinados em paralelo (cross_val_score)
+            com esse número de processos, sem poda entre folds. Nesse caso, use n_jobs=1 para não disputar núcleos.
 
     Retorna:
         dict: Dicionário com os melhores hiperparâmetros encontrados.
@@ -125,29 +197,36 @@ def tunar_modelo(nome_modelo: str,
             if espacos_busca_optuna is None or nome_modelo not in espacos_busca_optuna:
                 raise ValueError(f"Hiperparâmetros para '{nome_modelo}' não encontrados no espaço de busca.")
 
+            # Um único estudo, cujo objetivo é a acurácia média nos 3 folds: o sampler aprende com todas as
+            # tentativas e o MedianPruner interrompe as que estão abaixo da mediana entre um fold e outro
             kfold = KFold(n_splits=3, shuffle=True, random_state=42)
-            estudos = []
+            divisoes = list(kfold.split(X_treino))
 
             optuna.logging.set_verbosity(optuna.logging.WARNING)
 
-            for indice_treino, indice_validacao in kfold.split(X_treino):
-                X_tr, X_val = X_treino.iloc[indice_treino], X_treino.iloc[indice_validacao]
-                y_tr, y_val = y_treino.iloc[indice_treino], y_treino.iloc[indice_validacao]
-
-                estudo = optuna.create_study(direction="maximize")
-                estudo.optimize(partial(objetivo_optuna,
-                                        classe_modelo=classe_modelo,
-                                        espacos_busca_optuna=espacos_busca_optuna,
-                                        nome_modelo=nome_modelo,
-                                        X_treino=X_tr,
-                                        y_treino=y_tr,
-                                        X_validacao=X_val,
-                                        y_validacao=y_val),
-                                n_trials=n_iteracoes)
-                estudos.append(estudo)
-
-            melhor_estudo = max(estudos, key=lambda e: e.best_value)
-            melhores_parametros = melhor_estudo.best_params
+            estudo = optuna.create_study(direction="maximize",
+                                         sampler=optuna.samplers.TPESampler(),
+                                         pruner=optuna.pruners.MedianPruner())
+            # Os dados são convertidos para arrays NumPy uma única vez: recortar um array por índices é uma cópia
+            # simples, enquanto o .iloc reconstrói um DataFrame (índice e tipos) a cada fold de cada tentativa
+            X_np = np.ascontiguousarray(np.asarray(X_treino))
+            y_np = np.ascontiguousarray(np.asarray(y_treino))
+
+            acuracia_fold = acuracia_por_fold_em_cache(classe_modelo, X_np, y_np, divisoes)
+            acuracia_media = None
+            if n_jobs_folds != 1:
+                acuracia_media = acuracia_media_em_cache(classe_modelo, X_np, y_np, divisoes, n_jobs=n_jobs_folds)
+
+            estudo.optimize(partial(objetivo_optuna,
+                                    espacos_busca_optuna=espacos_busca_optuna,
+                                    nome_modelo=nome_modelo,
+                                    acuracia_fold=acuracia_fold,
+                                    n_folds=len(divisoes),
+                                    acuracia_media=acuracia_media),
+                            n_trials=n_iteracoes,
+                            n_jobs=n_jobs)
+
+            melhores_parametros = estudo.best_params
             print(f"Melhores Hiperparâmetros (optuna): {melhores_parametros}\n")
             log(f"Tuning para {classe_modelo.__name__} ({metodo})", inicio=inicio)
             return melhores_parametros